@@ -40,6 +40,12 @@ ATTR_RETRY = "retry"
 ATTR_ALLOWED_WINDOW_MINUTES = "allowed_window_minutes"
 
 DEFAULT_MAX_RETRIES = 3
+# Must exceed the coordinator update interval, otherwise the first cooldowns
+# expire before the next update and have no effect
+DEFAULT_BACKOFF_BASE = timedelta(minutes=5)
+DEFAULT_BACKOFF_MAX = timedelta(hours=1)
+# Caps the backoff exponent, timedelta would overflow after enough failures
+BACKOFF_MAX_EXPONENT = 32
 
 
 def check_tzinfo(
@@ -118,14 +124,29 @@ class TimeDeltaBarrier(Barrier):
         self,
         delta: timedelta,
         last_success: datetime | None = None,
+        backoff_base: timedelta = DEFAULT_BACKOFF_BASE,
+        backoff_max: timedelta = DEFAULT_BACKOFF_MAX,
     ):
         self._delta = delta
         self._last_success = last_success or dt_util.utc_from_timestamp(0)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+
+        # state
+        self._failures = 0
+        self._cooldown = dt_util.utc_from_timestamp(0)
 
     @check_tzinfo("now", optional=True)
     def check(self, now: datetime | None = None) -> None:
         now = now or self.utcnow()
 
+        if now < self._cooldown:
+            cooldown_until = dt_util.as_local(self._cooldown)
+            raise BarrierDeniedError(
+                code=TimeDeltaBarrierDenyError.COOLDOWN,
+                reason=f"barrier is in cooldown state until {cooldown_until}",
+            )
+
         diff = now - self._last_success
         if diff < self._delta:
             raise BarrierDeniedError(
@@ -137,10 +158,25 @@ class TimeDeltaBarrier(Barrier):
     def success(self, now: datetime | None = None) -> None:
         now = now or self.utcnow()
         self._last_success = now
+        self._failures = 0
+        self._cooldown = dt_util.utc_from_timestamp(0)
 
     @check_tzinfo("now", optional=True)
     def fail(self, now: datetime | None = None) -> None:
-        pass
+        now = now or self.utcnow()
+
+        # Exponential backoff: base * 2^(failures - 1), clamped to backoff_max
+        self._failures = self._failures + 1
+        exponent = min(self._failures - 1, BACKOFF_MAX_EXPONENT)
+        backoff = min(self._backoff_base * 2**exponent, self._backoff_max)
+        self._cooldown = now + backoff
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "fail registered (%s), setup cooldown barrier until %s",
+                self._failures,
+                dt_util.as_local(self._cooldown),
+            )
 
     def utcnow(self) -> datetime:
         return dt_util.utcnow()
@@ -154,11 +190,17 @@ class TimeDeltaBarrier(Barrier):
         return self._last_success
 
     def dump(self) -> dict[str, Any]:
-        return {ATTR_MAX_AGE: self.delta, ATTR_LAST_SUCCESS: self.last_success}
+        return {
+            ATTR_MAX_AGE: self.delta,
+            ATTR_LAST_SUCCESS: self.last_success,
+            ATTR_COOLDOWN: self._cooldown,
+            ATTR_RETRY: self._failures,
+        }
 
 
 class TimeDeltaBarrierDenyError(enum.Enum):
     NO_MAX_AGE = enum.auto()
+    COOLDOWN = enum.auto()
 
 
 class RetryableBarrier:
@@ -286,16 +328,17 @@ class TimeWindowBarrier(Barrier):
         now = now or self.utcnow()
 
         self._failures = self._failures + 1
-        _LOGGER.debug(f"fail registered ({self._failures}/{self._max_retries})")
+        _LOGGER.debug("fail registered (%s/%s)", self._failures, self._max_retries)
 
         if self._failures >= self._max_retries:
             self._force_next = False
             self._cooldown = now + (self._max_age / 2)
 
-            cooldown_until = dt_util.as_local(self._cooldown)
-            _LOGGER.debug(
-                f"max failures reached, setup cooldown barrier until {cooldown_until}"
-            )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "max failures reached, setup cooldown barrier until %s",
+                    dt_util.as_local(self._cooldown),
+                )
 
 
 class TimeWindowBarrierDenyError(enum.Enum):
@@ -17,6 +17,7 @@
 
 
 from datetime import timedelta
+from zoneinfo import ZoneInfo
 
 DOMAIN = "ideenergy"
 
@@ -28,6 +29,7 @@ MIN_SCAN_INTERVAL = 60
 UPDATE_WINDOW_START_MINUTE = 50
 UPDATE_WINDOW_END_MINUTE = 59
 API_USER_SESSION_TIMEOUT = 60
+MAX_CONCURRENT_API_REQUESTS = 2
 
 
 DATA_ATTR_MEASURE_ACCUMULATED = "measure_accumulated"
@@ -37,4 +39,8 @@ DATA_ATTR_HISTORICAL_GENERATION = "historical_generation"
 DATA_ATTR_HISTORICAL_POWER_DEMAND = "historical_power_demand"
 
 HISTORICAL_PERIOD_LENGHT = timedelta(days=7)
+
+# i-DE datetimes are in mainland Spain local time
+MAINLAND_SPAIN_ZONEINFO = ZoneInfo("Europe/Madrid")
+
 CONFIG_ENTRY_VERSION = 3
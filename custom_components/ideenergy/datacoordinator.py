@@ -16,8 +16,12 @@
 # USA.
 
 
+import asyncio
 import enum
+import functools
 import logging
+import operator
+from collections.abc import Callable, Coroutine
 from datetime import datetime, timedelta, timezone
 from typing import Any, TypedDict
 
@@ -33,19 +37,30 @@ from .const import (
     DATA_ATTR_MEASURE_ACCUMULATED,
     DATA_ATTR_MEASURE_INSTANT,
     HISTORICAL_PERIOD_LENGHT,
+    MAINLAND_SPAIN_ZONEINFO,
+    MAX_CONCURRENT_API_REQUESTS,
 )
 from .entity import IDeEntity
 
 
-class DataSetType(enum.IntFlag):
+class DataSetType(enum.Flag, boundary=enum.STRICT):
     NONE = 0
-    MEASURE = 1 << 0
-    HISTORICAL_CONSUMPTION = 1 << 1
-    HISTORICAL_GENERATION = 1 << 2
-    HISTORICAL_POWER_DEMAND = 1 << 3
+    MEASURE = enum.auto()
+    HISTORICAL_CONSUMPTION = enum.auto()
+    HISTORICAL_GENERATION = enum.auto()
+    HISTORICAL_POWER_DEMAND = enum.auto()
 
-    ALL = 0b1111
 
+# Iteration over a Flag yields only single-bit members, NONE is skipped
+_ITER_DATASETS = tuple(DataSetType)
+
+ALL_DATASETS = functools.reduce(operator.or_, _ITER_DATASETS, DataSetType.NONE)
+
+# Human readable labels for every possible combination of datasets
+_DS_LABELS = {
+    ds: (ds.name or "NONE").replace("|", ", ")
+    for ds in (DataSetType(i) for i in range(ALL_DATASETS.value + 1))
+}
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -75,12 +90,24 @@ class CoordinatorData(TypedDict):
 
 
 class IDeCoordinator(DataUpdateCoordinator):
+    # Method name and whether it takes the end of the historical period
+    _FETCHERS: dict[DataSetType, tuple[str, bool]] = {
+        DataSetType.MEASURE: ("get_direct_reading_data", False),
+        DataSetType.HISTORICAL_CONSUMPTION: ("get_historical_consumption_data", True),
+        DataSetType.HISTORICAL_GENERATION: ("get_historical_generation_data", True),
+        DataSetType.HISTORICAL_POWER_DEMAND: (
+            "get_historical_power_demand_data",
+            False,
+        ),
+    }
+
     def __init__(
         self,
         hass,
         api,
         barriers: dict[DataSetType, Barrier],
         update_interval: timedelta = timedelta(seconds=30),
+        max_concurrent_requests: int = MAX_CONCURRENT_API_REQUESTS,
     ):
         name = (
             f"{api.username}/{api._contract} coordinator" if api else "i-de coordinator"
@@ -100,10 +127,18 @@ class IDeCoordinator(DataUpdateCoordinator):
         self.api = api
         self.barriers = barriers
 
+        # Bound simultaneous API calls to avoid hitting server rate limits
+        self._api_sem = asyncio.Semaphore(max_concurrent_requests)
+
         # FIXME: platforms from HomeAssistant should have types
         self.platforms: list[str] = []
 
-        self.sensors: list[IDeEntity] = []
+        self.sensors: set[IDeEntity] = set()
+
+        # Union of datasets requested by registered sensors. Recalculated only when
+        # sensors are registered or unregistered.
+        self._aggregate_ds = DataSetType.NONE
+        self._aggregate_dirty = True
 
     async def _async_update_data(self):
         """Fetch data from API endpoint.
@@ -122,97 +157,123 @@ class IDeCoordinator(DataUpdateCoordinator):
 
         # Raise UpdateFailed is something were wrong
 
-        ds = DataSetType.NONE
-        for sensor in self.sensors:
-            for s_ds in sensor.I_DE_DATA_SETS:
-                ds = ds | s_ds
+        if self._aggregate_dirty:
+            self._aggregate_ds = functools.reduce(
+                operator.or_,
+                (s_ds for sensor in self.sensors for s_ds in sensor.I_DE_DATA_SETS),
+                DataSetType.NONE,
+            )
+            self._aggregate_dirty = False
 
-        dsstr = ds.name.replace("|", ", ")
-        _LOGGER.debug(f"Request update for datasets: {dsstr}")
+        ds = self._aggregate_ds
+
+        _LOGGER.debug("Request update for datasets: %s", _DS_LABELS[ds])
 
         updated_data = await self._async_update_data_raw(datasets=ds)
 
-        data = self.data | updated_data
-        return data
+        # DataUpdateCoordinator expects a new object, build it in a single pass
+        return {**self.data, **updated_data}
 
     async def _async_update_data_raw(
-        self, datasets: DataSetType = DataSetType.ALL, now: datetime | None = None
+        self, datasets: DataSetType = ALL_DATASETS, now: datetime | None = None
     ) -> dict[str, Any]:
-        now = now or dt_util.utcnow()
-        if now.tzinfo != timezone.utc:
+        if now is not None and now.tzinfo != timezone.utc:
             raise ValueError("now is missing tzinfo field")
 
-        requested = (x for x in DataSetType)
-        requested = (x for x in requested if x is not DataSetType.ALL)
-        requested = (x for x in requested if x & datasets)
-        requested = list(requested)  # type: ignore[assignment]
+        requested = [x for x in _ITER_DATASETS if x & datasets]
 
-        data = {}
+        # Bind frequently used attributes to locals
+        barriers = self.barriers
+        fetchers = self._FETCHERS
 
+        permitted = []
         for dataset in requested:
             # Barrier checks and handle exceptions
             try:
-                self.barriers[dataset].check()
+                barriers[dataset].check()
 
             except KeyError:
-                _LOGGER.debug(f"update ignored for {dataset.name}: no barrier defined")
+                _LOGGER.debug("update ignored for %s: no barrier defined", dataset.name)
                 continue
 
             except BarrierDeniedError as deny:
-                _LOGGER.debug(f"update denied for {dataset.name}: {deny.reason}")
+                _LOGGER.debug("update denied for %s: %s", dataset.name, deny.reason)
                 continue
 
-            _LOGGER.debug(f"update allowed for {dataset.name}")
+            _LOGGER.debug("update allowed for %s", dataset.name)
+            permitted.append((dataset, fetchers[dataset]))
 
-            # API calls and handle exceptions
-            try:
-                if dataset is DataSetType.MEASURE:
-                    data.update(await self.get_direct_reading_data())
+        # Nothing to do, all datasets were denied or ignored
+        if not permitted:
+            return {}
 
-                elif dataset is DataSetType.HISTORICAL_CONSUMPTION:
-                    data.update(await self.get_historical_consumption_data())
+        now = now or dt_util.utcnow()
 
-                elif dataset is DataSetType.HISTORICAL_GENERATION:
-                    data.update(await self.get_historical_generation_data())
+        # Historical datasets share the same period end, calculate it once.
+        # i-DE works in mainland Spain local time and the client has always been
+        # given naive datetimes, keep it that way.
+        end = now.astimezone(MAINLAND_SPAIN_ZONEINFO).replace(tzinfo=None)
+
+        calls = []
+        for _, (name, takes_period_end) in permitted:
+            fn = getattr(self, name)
+            calls.append(functools.partial(fn, end=end) if takes_period_end else fn)
+
+        # API calls are independent from each other, run them concurrently.
+        # Coroutines are created inside _guarded so none is left unawaited if the
+        # update is cancelled while waiting for the semaphore.
+        results = await asyncio.gather(
+            *[self._guarded(fn) for fn in calls], return_exceptions=True
+        )
 
-                elif dataset is DataSetType.HISTORICAL_POWER_DEMAND:
-                    data.update(await self.get_historical_power_demand_data())
+        data = {}
 
-                else:
-                    _LOGGER.debug(
-                        f"update ignored for {dataset.name}: not implemented yet"
-                    )
-                    continue
+        for (dataset, _), res in zip(permitted, results):
+            barrier = barriers[dataset]
+
+            # Handle exceptions
+            try:
+                if isinstance(res, BaseException):
+                    raise res
 
             except UnicodeDecodeError:
                 _LOGGER.debug(
-                    f"update error for {dataset.name}: invalid encoding. File a bug"
+                    "update error for %s: invalid encoding. File a bug", dataset.name
                 )
+                barrier.fail()
                 continue
 
             except ideenergy.RequestFailedError as e:
                 _LOGGER.debug(
-                    f"update error for {dataset.name}: "
-                    + f"{e.response.reason} ({e.response.status})"
+                    "update error for %s: %s (%s)",
+                    dataset.name,
+                    e.response.reason,
+                    e.response.status,
                 )
+                barrier.fail()
                 continue
 
             except ideenergy.CommandError as e:
                 _LOGGER.debug(
-                    f"update error for {dataset.name}: command error from API ({e!r})"
+                    "update error for %s: command error from API (%r)", dataset.name, e
                 )
+                barrier.fail()
                 continue
 
             except Exception as e:
                 _LOGGER.debug(
-                    f"update error for {dataset.name}: "
-                    + f"**FIXME** handle {dataset.name} raised exception: {e!r}"
+                    "update error for %s: **FIXME** handle %s raised exception: %r",
+                    dataset.name,
+                    dataset.name,
+                    e,
                 )
+                barrier.fail()
                 continue
 
-            self.barriers[dataset].success()
+            data.update(res)
+            barrier.success()
 
-            _LOGGER.debug(f"update successful for {dataset.name}")
+            _LOGGER.debug("update successful for %s", dataset.name)
 
         # delay = random.randint(DELAY_MIN_SECONDS * 10, DELAY_MAX_SECONDS * 10) / 10
         # _LOGGER.debug(f"  → Random delay: {delay} seconds")
@@ -221,15 +282,28 @@ class IDeCoordinator(DataUpdateCoordinator):
         return data
 
     def register_sensor(self, sensor: IDeEntity) -> None:
-        self.sensors.append(sensor)
-        _LOGGER.debug(f"Registered sensor '{sensor.__class__.__name__}'")
+        self.sensors.add(sensor)
+        self._aggregate_dirty = True
+        _LOGGER.debug("Registered sensor '%s'", sensor.__class__.__name__)
 
     def unregister_sensor(self, sensor: IDeEntity) -> None:
-        self.sensors.remove(sensor)
-        _LOGGER.debug(f"Unregistered sensor '{sensor.__class__.__name__}'")
+        self.sensors.discard(sensor)
+        self._aggregate_dirty = True
+        _LOGGER.debug("Unregistered sensor '%s'", sensor.__class__.__name__)
+
+    def seed_data(self, data: dict[str, Any]) -> None:
+        """Merge initial values (i.e. restored states) into coordinator data.
+
+        Listeners are not notified on purpose: async_set_updated_data would run
+        every attached listener, cancel pending refreshes and mark the coordinator
+        as successfully updated. Use it for real data pushes instead.
+        """
+        self.data = {**self.data, **data}  # type: ignore[assignment]
+        _LOGGER.debug("Seeded data for %s", ", ".join(data))
 
-    def update_internal_data(self, data: dict[str, Any]):
-        self.data = self.data | data  # type: ignore[assignment]
+    async def _guarded(self, fn: Callable[[], Coroutine[Any, Any, Any]]) -> Any:
+        async with self._api_sem:
+            return await fn()
 
     async def get_direct_reading_data(self) -> dict[str, int | float]:
         data = await self.api.get_measure()
@@ -239,15 +313,13 @@ class IDeCoordinator(DataUpdateCoordinator):
             DATA_ATTR_MEASURE_INSTANT: data.instant,
         }
 
-    async def get_historical_consumption_data(self) -> Any:
-        end = datetime.today()
+    async def get_historical_consumption_data(self, *, end: datetime) -> Any:
         start = end - HISTORICAL_PERIOD_LENGHT
         data = await self.api.get_historical_consumption(start=start, end=end)
 
         return {DATA_ATTR_HISTORICAL_CONSUMPTION: data}
 
-    async def get_historical_generation_data(self) -> Any:
-        end = datetime.today()
+    async def get_historical_generation_data(self, *, end: datetime) -> Any:
         start = end - HISTORICAL_PERIOD_LENGHT
         data = await self.api.get_historical_generation(start=start, end=end)
 
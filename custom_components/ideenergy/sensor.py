@@ -50,11 +50,10 @@ from homeassistant.core import HomeAssistant, callback, dt_util
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import DiscoveryInfoType
-from homeassistant.util import dt as dtutil
 from homeassistant_historical_sensor import HistoricalSensor, HistoricalState
 from ideenergy.types import PeriodValue
 
-from .const import DOMAIN
+from .const import DOMAIN, MAINLAND_SPAIN_ZONEINFO
 from .datacoordinator import (
     DATA_ATTR_HISTORICAL_CONSUMPTION,
     DATA_ATTR_HISTORICAL_GENERATION,
@@ -68,7 +67,6 @@ from .fixes import async_fix_statistics
 
 PLATFORM = "sensor"
 
-MAINLAND_SPAIN_ZONEINFO = dtutil.zoneinfo.ZoneInfo("Europe/Madrid")
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -264,12 +262,10 @@ class AccumulatedConsumption(RestoreEntity, IDeEntity, SensorEntity):
         self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-
         saved_data = await async_get_last_state_safe(self, float)
-        self.coordinator.update_internal_data(
-            {DATA_ATTR_MEASURE_ACCUMULATED: saved_data}
-        )
+        self.coordinator.seed_data({DATA_ATTR_MEASURE_ACCUMULATED: saved_data})
+
+        await super().async_added_to_hass()
 
 
 class InstantPowerDemand(RestoreEntity, IDeEntity, SensorEntity):
@@ -292,10 +288,10 @@ class InstantPowerDemand(RestoreEntity, IDeEntity, SensorEntity):
         self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-
         saved_data = await async_get_last_state_safe(self, float)
-        self.coordinator.update_internal_data({DATA_ATTR_MEASURE_INSTANT: saved_data})
+        self.coordinator.seed_data({DATA_ATTR_MEASURE_INSTANT: saved_data})
+
+        await super().async_added_to_hass()
 
 
 class HistoricalConsumption(
@@ -317,7 +313,7 @@ class HistoricalConsumption(
         # updating every minute with the energy consumption during the past minute:
         # state class total, last_reset updated every state change.
         #
-        # (*) last_reset is set in states by historical_states_from_historical_api_data
+        # (*) last_reset is set in states by historical_states_from_period_values
         # (*) set only in internal statistics model
         #
         # DON'T set for HistoricalSensors, you will mess your statistics.
@@ -353,7 +349,7 @@ class HistoricalGeneration(
         # updating every minute with the energy consumption during the past minute:
         # state class total, last_reset updated every state change.
         #
-        # (*) last_reset is set in states by historical_states_from_historical_api_data
+        # (*) last_reset is set in states by historical_states_from_period_values
         # (*) set only in internal statistics model
         #
         # DON'T set for HistoricalSensors, you will mess your statistics.
@@ -390,13 +386,14 @@ class HistoricalPowerDemand(HistoricalSensorMixin, IDeEntity, SensorEntity):
             # FIXME: This should be None, fix ha-historical-sensor
             return []
 
-        def demand_at_instant_as_historical_state(item):
-            return HistoricalState(
+        tz = MAINLAND_SPAIN_ZONEINFO
+        ret = [
+            HistoricalState(
                 state=item.value / 1000,
-                dt=item.dt.replace(tzinfo=MAINLAND_SPAIN_ZONEINFO),
+                dt=item.dt.replace(tzinfo=tz) if item.dt.tzinfo is None else item.dt,
             )
-
-        ret = [demand_at_instant_as_historical_state(x) for x in data.demands]
+            for item in data.demands
+        ]
         return ret
 
 
@@ -428,39 +425,29 @@ async def async_setup_entry(
     async_add_devices(sensors)
 
 
-def historical_states_from_historical_api_data(
-    data: list[dict] | None = None,
-) -> list[HistoricalState]:
-    def _convert_item(item):
-        # FIXME: What about canary islands?
-        dt = item["end"].replace(tzinfo=MAINLAND_SPAIN_ZONEINFO)
-        last_reset = item["start"].replace(tzinfo=MAINLAND_SPAIN_ZONEINFO)
-
-        return HistoricalState(
-            state=item["value"] / 1000,
-            dt=dt,
-            attributes={"last_reset": last_reset},
-        )
-
-    return [_convert_item(item) for item in data or []]
-
-
 def historical_states_from_period_values(
     period_values: list[PeriodValue],
 ) -> list[HistoricalState]:
-    def fn():
-        for item in period_values:
-            # FIXME: What about canary islands?
-            dt = item.end.replace(tzinfo=MAINLAND_SPAIN_ZONEINFO)
-            last_reset = item.start.replace(tzinfo=MAINLAND_SPAIN_ZONEINFO)
+    # FIXME: What about canary islands?
+    tz = MAINLAND_SPAIN_ZONEINFO
+
+    ret = []
+    for item in period_values:
+        # Only naive datetimes need tzinfo, skip the copy otherwise
+        end = item.end.replace(tzinfo=tz) if item.end.tzinfo is None else item.end
+        start = (
+            item.start.replace(tzinfo=tz) if item.start.tzinfo is None else item.start
+        )
 
-            yield HistoricalState(
+        ret.append(
+            HistoricalState(
                 state=item.value / 1000,
-                dt=dt,
-                attributes={"last_reset": last_reset},
+                dt=end,
+                attributes={"last_reset": start},
             )
+        )
 
-    return list(fn())
+    return ret
 
 
 async def async_get_last_state_safe(